@@ -1,26 +1,103 @@
+import asyncio
+import dataclasses
+import fcntl
 import tempfile
 import os
-from typing import BinaryIO
-from pathlib import Path
-from io import BytesIO
+import shutil
+import socket
+from typing import IO, Awaitable, BinaryIO, cast
 
 import ffmpeg
 from fastapi import UploadFile
 
 from app import ports
+from app.adapters import streaming_upload_body
+from app.adapters import upload_file_reader
 from app.config.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Tamaño de los bloques que se mueven entre el upload y FFmpeg
+_CHUNK_SIZE = 1 << 20
+
+# Buffer solicitado para los pipes de FFmpeg; el kernel lo limita a /proc/sys/fs/pipe-max-size (1 MiB por defecto)
+_PIPE_SIZE = 1 << 20
+
+# Hilos por proceso de FFmpeg; junto con max_concurrency acota el uso total de núcleos
+_FFMPEG_THREADS = 2
+
+# Bytes iniciales que se entregan a ffprobe para detectar el codec de audio de una entrada por pipe
+_PROBE_SIZE = 1 << 20
+
+# Directorio para los archivos temporales: tmpfs (/dev/shm) evita I/O a disco, pero lo escrito ocupa RAM.
+# Cada archivo retiene un cupo del semáforo de FFmpeg, que acota cuántos conviven; en contenedores con /dev/shm
+# pequeño conviene usar temp_dir. Si no queda espacio para un archivo, se copia al directorio temporal del sistema
+_DEFAULT_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()  # nosec B108
+
+# Contenedores que FFmpeg necesita recorrer con seek (índice moov al final), no se pueden leer desde un pipe.
+# Se reconocen por extensión, por Content-Type o por la caja `ftyp` al inicio del archivo (p. ej. un Blob sin extensión)
+_SEEKABLE_INPUT_EXTENSIONS: frozenset[str] = frozenset({".mp4", ".mov", ".m4v", ".3gp"})
+_SEEKABLE_INPUT_CONTENT_TYPES: frozenset[str] = frozenset({"video/mp4", "video/quicktime", "video/3gpp", "video/x-m4v", "audio/mp4"})
+
+# Aviso de FFmpeg cuando no escribió ningún paquete; sale con código 0, pero el audio estaría vacío
+_EMPTY_OUTPUT_MARKER = b"Output file is empty"
+
+# Formatos de audio que Whisper acepta tal cual; se envían sin pasar por FFmpeg
+_PASSTHROUGH_EXTENSIONS: frozenset[str] = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg"})
+
+
+@dataclasses.dataclass(frozen=True)
+class _AudioOutput:
+    """Formato en que FFmpeg entrega el audio para Whisper."""
+
+    codec_args: tuple[str, ...]
+    container: str
+    extension: str
+    content_type: str
+
+    @property
+    def is_remux(self) -> bool:
+        """Indica si el audio se copia sin recodificar."""
+        return self.codec_args == _COPY_CODEC_ARGS
+
+
+_COPY_CODEC_ARGS = ("-acodec", "copy")
+
+# Whisper convierte todo a mono de 16 kHz: codificar así desde el inicio reduce CPU y bytes a subir sin perder calidad
+_MP3_OUTPUT = _AudioOutput(("-acodec", "libmp3lame", "-ac", "1", "-ar", "16000", "-b:a", "32k"), "mp3", ".mp3", "audio/mpeg")
+
+# Codecs que Whisper acepta tal cual: se copian a un contenedor soportado en vez de recodificarse.
+# AAC queda fuera: su contenedor aceptado (m4a) necesita seek al escribirse y no puede salir por un pipe.
+# FLAC también: al ser sin pérdida, copiarlo supera con facilidad el límite de 25 MB de Whisper
+_REMUX_OUTPUTS = {
+    "mp3": _AudioOutput(_COPY_CODEC_ARGS, "mp3", ".mp3", "audio/mpeg"),
+    "opus": _AudioOutput(_COPY_CODEC_ARGS, "ogg", ".ogg", "audio/ogg"),
+    "vorbis": _AudioOutput(_COPY_CODEC_ARGS, "ogg", ".ogg", "audio/ogg"),
+}
+
+# Bitrate máximo (bits/s) para copiar el audio; por encima, o si no se conoce, recodificar a _MP3_OUTPUT sale más liviano
+_MAX_REMUX_BIT_RATE = 64_000
+
 
 class FFmpegAudioExtractionAdapter(ports.AudioExtractionService):
     """Adapter para extraer audio usando FFmpeg."""
 
-    def __init__(self) -> None:
-        """Inicializa el adapter de FFmpeg."""
-        logger.info("FFmpeg audio extraction adapter inicializado")
+    def __init__(self, max_concurrency: int | None = None, temp_dir: str | None = None) -> None:
+        """
+        Inicializa el adapter de FFmpeg.
 
-    async def extract_audio_stream(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str]:
+        Args:
+            max_concurrency: Máximo de procesos de FFmpeg simultáneos. Por defecto, la mitad de los núcleos
+            temp_dir: Directorio para los archivos temporales. Por defecto, /dev/shm si está disponible
+        """
+        max_concurrency = max_concurrency or max(1, (os.cpu_count() or 2) // 2)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._temp_dir = temp_dir or _DEFAULT_TEMP_DIR
+        # Referencias a las extracciones en curso para que no sean recolectadas antes de terminar
+        self._extractions: set[asyncio.Task[None]] = set()
+        logger.info("FFmpeg audio extraction adapter inicializado", max_concurrency=max_concurrency, temp_dir=self._temp_dir)
+
+    async def extract_audio_stream(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str, str]:
         """
         Extrae audio de un archivo de video/audio y retorna un stream.
 
@@ -28,86 +105,357 @@ class FFmpegAudioExtractionAdapter(ports.AudioExtractionService):
             uploaded_file: Archivo subido por el usuario
 
         Returns:
-            Tupla con (stream_de_audio, nombre_archivo)
+            Tupla con (stream_de_audio, nombre_archivo, content_type)
         """
-        file_extension = Path(uploaded_file.filename or "").suffix.lower()
-
-        logger.info(
-            "Analizando archivo para extracción de audio",
-            filename=uploaded_file.filename,
-            file_extension=file_extension,
-            file_size=uploaded_file.size,
-        )
+        file_stem, file_extension = _split_filename(uploaded_file.filename)
 
         # Si ya es un formato de audio soportado por Whisper, pasarlo directamente
-        if file_extension in [".mp3", ".wav", ".m4a", ".flac", ".ogg"]:
+        if file_extension in _PASSTHROUGH_EXTENSIONS:
             logger.info(
                 "Archivo ya está en formato de audio soportado, usando directamente",
                 filename=uploaded_file.filename,
                 file_extension=file_extension,
+                file_size=uploaded_file.size,
+            )
+            return (
+                upload_file_reader.open_upload(uploaded_file.file),
+                uploaded_file.filename or "audio",
+                uploaded_file.content_type or "application/octet-stream",
             )
-            await uploaded_file.seek(0)  # Asegurar que estamos al inicio
-            return uploaded_file.file, uploaded_file.filename or "audio"
 
         # Para videos o formatos no soportados, extraer audio
-        logger.info("Archivo requiere extracción de audio", filename=uploaded_file.filename, file_extension=file_extension)
-        return await self._extract_audio_with_ffmpeg(uploaded_file)
-
-    async def _extract_audio_with_ffmpeg(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str]:
-        """Extrae audio usando ffmpeg."""
-        logger.info("Iniciando extracción de audio con FFmpeg", filename=uploaded_file.filename)
+        return await self._extract_audio_with_ffmpeg(uploaded_file, file_stem, file_extension)
 
-        # Crear archivos temporales
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.filename or "").suffix) as input_temp:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as output_temp:
+    async def _extract_audio_with_ffmpeg(self, uploaded_file: UploadFile, file_stem: str, file_extension: str) -> tuple[BinaryIO, str, str]:
+        """Extrae audio usando ffmpeg, retornando un stream que se llena mientras FFmpeg produce el audio."""
+        audio_stream = streaming_upload_body.StreamingUploadBody()
+        extraction: Awaitable[int]
+        # FFprobe analiza solo el inicio del archivo; si va por pipe, ese mismo bloque se reenvía luego a FFmpeg
+        head = await uploaded_file.read(_PROBE_SIZE)
+        # El cupo de FFmpeg se toma antes de copiar a disco y de ejecutar ffprobe, y se libera al terminar la extracción.
+        # Así acota también el espacio de temp_dir (RAM, si es tmpfs) que ocupan las solicitudes simultáneas, y el consumidor
+        # no abre la solicitud a OpenAI hasta que FFmpeg puede producir audio, en vez de esperar el cupo con la conexión abierta
+        await self._semaphore.acquire()
+        try:
+            if _needs_seekable_input(file_extension, uploaded_file.content_type, head):
+                await uploaded_file.seek(0)
+                temp_dir = _staging_dir(self._temp_dir, uploaded_file.size)
+                input_target = await _stage_to_temp_file(uploaded_file, file_extension, temp_dir)
                 try:
-                    logger.info("Creando archivos temporales para extracción", input_temp=input_temp.name, output_temp=output_temp.name)
-
-                    # Escribir archivo de entrada
-                    content = await uploaded_file.read()
-                    input_temp.write(content)
-                    input_temp.flush()
-
-                    logger.info("Archivo temporal de entrada creado", input_size=len(content), input_file=input_temp.name)
-
-                    # Extraer audio con ffmpeg
-                    logger.info("Ejecutando FFmpeg para extracción de audio")
-                    try:
-                        (
-                            ffmpeg.input(input_temp.name)
-                            .output(output_temp.name, acodec="mp3", audio_bitrate="128k")
-                            .overwrite_output()
-                            .run(capture_stdout=True, capture_stderr=True)
-                        )
-                    except ffmpeg.Error as e:
-                        # Capturar stderr para ver el error específico
-                        stderr_output = e.stderr.decode("utf-8", errors="replace") if e.stderr else "No stderr available"
-                        logger.error("FFmpeg falló con error específico", filename=uploaded_file.filename, stderr=stderr_output)
-                        raise
-
-                    # Leer el archivo de audio extraído
-                    with open(output_temp.name, "rb") as audio_file:
-                        audio_content = audio_file.read()
-
-                    logger.info("Audio extraído exitosamente", output_size=len(audio_content), output_file=output_temp.name)
-
-                    # Crear stream en memoria
-                    audio_stream = BytesIO(audio_content)
-                    audio_filename = f"{Path(uploaded_file.filename or 'audio').stem}.mp3"
-
-                    logger.info("Stream de audio creado", audio_filename=audio_filename, stream_size=len(audio_content))
-
-                    return audio_stream, audio_filename
-
-                except Exception as e:
-                    logger.error(
-                        "Error durante extracción de audio con FFmpeg", filename=uploaded_file.filename, error=str(e), exc_info=True
-                    )
+                    audio_codec, audio_bit_rate = await _probe_audio_stream(input_target, uploaded_file.size)
+                except BaseException:
+                    os.unlink(input_target)
                     raise
+                output = _output_for_stream(audio_codec, audio_bit_rate)
+                extraction = self._extract_from_temp_file(input_target, output, audio_stream)
+            else:
+                input_target = "pipe:0"
+                audio_codec, audio_bit_rate = await _probe_audio_stream(input_target, uploaded_file.size, head)
+                output = _output_for_stream(audio_codec, audio_bit_rate)
+                extraction = self._extract_from_pipe(uploaded_file, head, output, audio_stream)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        # La extracción corre en segundo plano; el consumidor del stream sube el audio a medida que se produce
+        task = asyncio.create_task(self._run_extraction(extraction, uploaded_file, audio_stream))
+        self._extractions.add(task)
+        task.add_done_callback(self._extractions.discard)
+        # Si el consumidor deja el stream antes de terminar, cancelar la extracción: mata FFmpeg y libera su cupo
+        audio_stream.add_close_callback(task.cancel)
+
+        audio_filename = f"{file_stem}{output.extension}"
+        logger.info(
+            "Extrayendo audio con FFmpeg",
+            filename=uploaded_file.filename,
+            file_size=uploaded_file.size,
+            input_file=input_target,
+            audio_filename=audio_filename,
+            audio_codec=audio_codec,
+            audio_bit_rate=audio_bit_rate,
+            remux=output.is_remux,
+        )
+
+        return cast(BinaryIO, audio_stream), audio_filename, output.content_type
+
+    async def _run_extraction(
+        self, extraction: Awaitable[int], uploaded_file: UploadFile, audio_stream: streaming_upload_body.StreamingUploadBody
+    ) -> None:
+        """Ejecuta la extracción y notifica al stream su fin o el error ocurrido."""
+        try:
+            output_size = await extraction
+            audio_stream.finish()
+            logger.info("Audio extraído exitosamente", filename=uploaded_file.filename, output_size=output_size)
+
+        except asyncio.CancelledError:
+            logger.info("Extracción cancelada: el upload dejó de consumir el audio", filename=uploaded_file.filename)
+            # Un consumidor que siga leyendo no debe quedar esperando bloques que ya no se producirán
+            audio_stream.fail(BrokenPipeError("La extracción de audio fue cancelada"))
+            raise
+
+        except ffmpeg.Error as e:
+            # Capturar stderr para ver el error específico
+            stderr_output = e.stderr.decode("utf-8", errors="replace") if e.stderr else "No stderr available"
+            logger.error("FFmpeg falló con error específico", filename=uploaded_file.filename, stderr=stderr_output)
+            audio_stream.fail(e)
+
+        except OSError as e:
+            # Errores esperables del sistema (FFmpeg no instalado, sin espacio en temp_dir): basta el mensaje, sin traceback
+            logger.error(
+                "Error del sistema durante extracción de audio", filename=uploaded_file.filename, error=str(e), error_type=type(e).__name__
+            )
+            audio_stream.fail(e)
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.exception("Error inesperado durante extracción de audio con FFmpeg", filename=uploaded_file.filename, error=str(e))
+            audio_stream.fail(e)
+
+    async def _extract_from_pipe(
+        self, uploaded_file: UploadFile, head: bytes, output: _AudioOutput, audio_stream: streaming_upload_body.StreamingUploadBody
+    ) -> int:
+        """
+        Extrae el audio enviando el upload por stdin a FFmpeg, sin pasar por disco.
+
+        Se ejecuta con el cupo de FFmpeg ya tomado antes de ejecutar ffprobe; lo libera al terminar.
+        """
+        try:
+            return await self._run_ffmpeg(_ffmpeg_args("pipe:0", output), audio_stream, uploaded_file, head)
+
+        finally:
+            self._semaphore.release()
+
+    async def _extract_from_temp_file(
+        self, input_path: str, output: _AudioOutput, audio_stream: streaming_upload_body.StreamingUploadBody
+    ) -> int:
+        """
+        Extrae el audio desde un archivo temporal, para contenedores que requieren seek.
+
+        Se ejecuta con el cupo de FFmpeg ya tomado al copiar el archivo; elimina el archivo y libera el cupo al terminar.
+        """
+        try:
+            return await self._run_ffmpeg(_ffmpeg_args(input_path, output), audio_stream)
+
+        finally:
+            # Limpiar archivo temporal
+            os.unlink(input_path)
+            self._semaphore.release()
+            logger.debug("Archivo temporal eliminado", input_file=input_path)
+
+    async def _run_ffmpeg(
+        self,
+        args: list[str],
+        audio_stream: streaming_upload_body.StreamingUploadBody,
+        uploaded_file: UploadFile | None = None,
+        head: bytes = b"",
+    ) -> int:
+        """
+        Lanza FFmpeg sin bloquear el event loop, alimentando stdin (si aplica) y drenando stdout/stderr concurrentemente.
+
+        Quien lo llama debe tener tomado el cupo del semáforo de FFmpeg.
+
+        Args:
+            args: Argumentos de FFmpeg
+            audio_stream: Stream al que se entrega el audio a medida que se produce
+            uploaded_file: Archivo a enviar por stdin, o None si FFmpeg lee de disco
+            head: Bloque inicial del archivo ya leído, que se envía antes del resto
+
+        Returns:
+            Tamaño en bytes del audio extraído
+        """
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE if uploaded_file is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_CHUNK_SIZE,
+        )
+        pipes = [
+            asyncio.ensure_future(_drain_stdout(cast(asyncio.StreamReader, process.stdout), audio_stream)),
+            asyncio.ensure_future(cast(asyncio.StreamReader, process.stderr).read()),
+        ]
+        if uploaded_file is not None:
+            pipes.append(asyncio.ensure_future(_feed_stdin(cast(asyncio.StreamWriter, process.stdin), head, uploaded_file)))
+        try:
+            await asyncio.gather(*pipes)
+            output_size = cast(int, pipes[0].result())
+            stderr = cast(bytes, pipes[1].result())
+            return_code = await process.wait()
+        finally:
+            if process.returncode is None:
+                for pipe in pipes:
+                    pipe.cancel()
+                await asyncio.gather(*pipes, return_exceptions=True)
+                process.kill()
+                # wait() no retorna hasta cerrar los pipes, así que se drena lo que FFmpeg dejó pendiente
+                await process.communicate()
+
+        if return_code != 0 or _EMPTY_OUTPUT_MARKER in stderr:
+            raise ffmpeg.Error("ffmpeg", b"", stderr)
+        return output_size
+
+
+def _ffmpeg_args(input_target: str, output: _AudioOutput) -> list[str]:
+    """Construye los argumentos de FFmpeg para escribir el primer stream de audio por stdout."""
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-i",
+        input_target,
+        "-map",
+        "0:a:0",
+        *output.codec_args,
+        "-threads",
+        str(_FFMPEG_THREADS),
+        "-f",
+        output.container,
+        "pipe:1",
+    ]
+
+
+def _split_filename(filename: str | None) -> tuple[str, str]:
+    """Separa el nombre de un archivo subido en (nombre_base, extensión), con la extensión en minúsculas."""
+    file_stem, file_extension = os.path.splitext(os.path.basename(filename or ""))
+    return file_stem or "audio", file_extension.casefold()
+
+
+def _needs_seekable_input(file_extension: str, content_type: str | None, head: bytes) -> bool:
+    """Indica si la entrada es un contenedor MP4/MOV, que FFmpeg debe leer desde disco y no por pipe."""
+    return (
+        file_extension in _SEEKABLE_INPUT_EXTENSIONS
+        or (content_type or "").casefold() in _SEEKABLE_INPUT_CONTENT_TYPES
+        # ISO BMFF: la primera caja es `ftyp` (tamaño de 4 bytes seguido del tipo)
+        or head[4:8] == b"ftyp"
+    )
+
+
+def _output_for_stream(audio_codec: str | None, audio_bit_rate: int | None) -> _AudioOutput:
+    """Elige el formato de salida: copiar el audio si Whisper acepta el codec y su bitrate es bajo, o recodificar a MP3."""
+    if audio_bit_rate is None or audio_bit_rate > _MAX_REMUX_BIT_RATE:
+        return _MP3_OUTPUT
+    return _REMUX_OUTPUTS.get(audio_codec or "", _MP3_OUTPUT)
+
+
+async def _probe_audio_stream(input_target: str, file_size: int | None, head: bytes | None = None) -> tuple[str | None, int | None]:
+    """
+    Detecta con ffprobe el codec y el bitrate del primer stream de audio.
+
+    Si el contenedor no declara el bitrate del stream (p. ej. Opus en WebM/Matroska), se usa el del archivo completo,
+    tamaño / duración: incluye el video, así que es una cota superior del bitrate del audio.
+
+    Args:
+        input_target: Ruta del archivo, o "pipe:0" para analizar `head` por stdin
+        file_size: Tamaño del archivo completo en bytes, si se conoce
+        head: Bloque inicial del archivo cuando se analiza por stdin
+
+    Returns:
+        Tupla con (codec, bitrate en bits/s); cada valor es None si no se pudo determinar
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=codec_name,bit_rate:format=duration",
+            "-of",
+            "default=noprint_wrappers=1",
+            input_target,
+            stdin=asyncio.subprocess.PIPE if head is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate(head)
+    except OSError as e:
+        logger.warning("No fue posible ejecutar ffprobe, se recodificará el audio", error=str(e))
+        return None, None
+
+    # Con una entrada truncada ffprobe puede terminar con error aunque haya identificado el codec.
+    # Salida `clave=valor`; los valores que el contenedor no declara son "N/A"
+    fields = dict(line.partition("=")[::2] for line in stdout.decode("utf-8", errors="replace").splitlines())
+    audio_bit_rate = _parse_probe_number(fields.get("bit_rate"))
+    duration = _parse_probe_number(fields.get("duration"))
+    if audio_bit_rate is None and duration and file_size:
+        audio_bit_rate = file_size * 8 / duration
+    return fields.get("codec_name") or None, int(audio_bit_rate) if audio_bit_rate is not None else None
+
+
+def _parse_probe_number(value: str | None) -> float | None:
+    """Convierte un valor numérico de ffprobe, o retorna None si falta o es "N/A"."""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _staging_dir(temp_dir: str, file_size: int | None) -> str:
+    """Retorna temp_dir si tiene espacio libre para el archivo; si no, el directorio temporal del sistema."""
+    fallback_dir = tempfile.gettempdir()
+    if file_size is None or os.path.realpath(temp_dir) == os.path.realpath(fallback_dir):
+        return temp_dir
+    try:
+        free_bytes = shutil.disk_usage(temp_dir).free
+    except OSError:
+        return fallback_dir
+    if free_bytes >= file_size:
+        return temp_dir
+    logger.warning(
+        "Sin espacio en temp_dir para el archivo, se usa el directorio temporal del sistema",
+        temp_dir=temp_dir,
+        fallback_dir=fallback_dir,
+        file_size=file_size,
+        free_bytes=free_bytes,
+    )
+    return fallback_dir
+
+
+async def _stage_to_temp_file(uploaded_file: UploadFile, file_extension: str, temp_dir: str) -> str:
+    """Copia el upload a un archivo temporal en temp_dir y retorna su ruta; quien lo llama debe eliminarlo."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension, dir=temp_dir) as input_temp:
+        try:
+            # Copiar por bloques en un hilo: sin materializar el upload en memoria ni bloquear el loop con escrituras a disco
+            await asyncio.to_thread(shutil.copyfileobj, uploaded_file.file, input_temp, _CHUNK_SIZE)
+        except BaseException:
+            os.unlink(input_temp.name)
+            raise
+
+    return input_temp.name
+
+
+async def _feed_stdin(stdin: asyncio.StreamWriter, head: bytes, uploaded_file: UploadFile) -> None:
+    """Copia el upload a stdin de FFmpeg por bloques, empezando por el bloque ya leído, para no cargarlo completo en memoria."""
+    _grow_pipe(stdin.transport)
+    try:
+        stdin.write(head)
+        while chunk := await uploaded_file.read(_CHUNK_SIZE):
+            stdin.write(chunk)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # FFmpeg terminó antes de consumir toda la entrada; su código de salida indica la causa
+        logger.warning("FFmpeg cerró stdin antes de recibir todo el archivo", filename=uploaded_file.filename)
+    finally:
+        stdin.close()
+
+
+async def _drain_stdout(stdout: asyncio.StreamReader, audio_stream: streaming_upload_body.StreamingUploadBody) -> int:
+    """Lee stdout de FFmpeg por bloques hasta EOF, entregándolos al stream; retorna el total de bytes leídos."""
+    total = 0
+    while chunk := await stdout.read(_CHUNK_SIZE):
+        await audio_stream.feed(chunk)
+        total += len(chunk)
+    return total
+
 
-                finally:
-                    # Limpiar archivos temporales
-                    logger.debug("Limpiando archivos temporales")
-                    os.unlink(input_temp.name)
-                    os.unlink(output_temp.name)
-                    logger.debug("Archivos temporales eliminados exitosamente")
+def _grow_pipe(transport: asyncio.BaseTransport) -> None:
+    """Amplía el buffer del pipe para evitar bloqueos con escrituras en ráfaga (solo Linux)."""
+    try:
+        pipe: IO[bytes] | None = transport.get_extra_info("pipe")
+        if pipe is not None:
+            fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+        else:
+            # uvloop conecta los subprocesos con pares de sockets Unix en vez de pipes
+            transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _PIPE_SIZE)
+    except (AttributeError, OSError):
+        logger.debug("No fue posible ampliar el buffer del pipe")
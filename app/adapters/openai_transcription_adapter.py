@@ -1,25 +1,68 @@
+import asyncio
+import email.utils
+import random
+import time
+from concurrent import futures
+from typing import BinaryIO
+
+import httpx
+import openai
 from fastapi import UploadFile
-from openai import OpenAI
 
 from app import ports
+from app.adapters import upload_file_reader
 from app.config.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Transcripciones simultáneas; cada una ocupa un hilo durante todo el upload y la inferencia
+MAX_CONCURRENT_UPLOADS = 32
+
+# Timeout de cada solicitud a OpenAI: la transcripción de un audio largo puede tardar minutos
+_REQUEST_TIMEOUT = httpx.Timeout(600, connect=10)
+
+# Intentos por transcripción ante errores transitorios de OpenAI
+_MAX_ATTEMPTS = 3
+
+# Espera entre intentos, como la del SDK: exponencial desde 0,5 s hasta 8 s con jitter, salvo que OpenAI indique
+# otra con Retry-After y no supere el máximo razonable
+_INITIAL_RETRY_DELAY = 0.5
+_MAX_RETRY_DELAY = 8.0
+_MAX_RETRY_AFTER = 60.0
+
+# Status que vale la pena reintentar cuando OpenAI no lo indica con `x-should-retry`: timeout, conflicto de lock y rate limit
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
 
 class OpenAITranscriptionAdapter(ports.TranscriptionService):
     """Adapter para el servicio de transcripción usando OpenAI."""
 
-    def __init__(self, api_key: str | None = None, audio_extraction_service: ports.AudioExtractionService | None = None) -> None:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        audio_extraction_service: ports.AudioExtractionService | None = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
+    ) -> None:
         """
         Inicializa el adapter de OpenAI.
 
         Args:
             api_key: API key de OpenAI. Si no se proporciona, se usa la variable de entorno.
             audio_extraction_service: Servicio de extracción de audio inyectado
+            max_concurrent_uploads: Máximo de transcripciones en curso; las demás esperan sin ocupar hilos
         """
-        self._client = OpenAI(api_key=api_key)
+        # Un único cliente HTTP para todas las transcripciones: las conexiones (y sus sesiones TLS) se reutilizan,
+        # con un pool del tamaño del pool de hilos para que ningún upload espere una conexión libre
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_concurrent_uploads, max_keepalive_connections=max_concurrent_uploads),
+            timeout=_REQUEST_TIMEOUT,
+        )
+        # Los reintentos del SDK reenviarían un stream ya consumido; se reintenta en transcribe_from_upload, rebobinándolo
+        self._client = openai.OpenAI(api_key=api_key, http_client=self._http_client, max_retries=0)
         self._audio_extraction_service = audio_extraction_service
+        # Pool propio para las llamadas bloqueantes del SDK, con un hilo garantizado por transcripción admitida
+        self._upload_executor = futures.ThreadPoolExecutor(max_workers=max_concurrent_uploads, thread_name_prefix="openai-upload")
+        self._upload_slots = asyncio.Semaphore(max_concurrent_uploads)
 
         logger.info("OpenAI adapter inicializado", has_audio_extraction_service=audio_extraction_service is not None)
 
@@ -34,33 +77,171 @@ class OpenAITranscriptionAdapter(ports.TranscriptionService):
         Returns:
             Texto transcrito del audio
         """
-        logger.info(
-            "Iniciando transcripción con OpenAI",
-            filename=uploaded_file.filename,
-            model=model,
-            has_extraction_service=self._audio_extraction_service is not None,
-        )
-
         try:
-            # Extraer audio si es necesario (solo si se inyectó el servicio)
-            if self._audio_extraction_service:
-                logger.info("Extrayendo audio del archivo", filename=uploaded_file.filename)
-                audio_stream, filename = await self._audio_extraction_service.extract_audio_stream(uploaded_file)
-                logger.info("Audio extraído exitosamente", extracted_filename=filename)
-            else:
-                # Fallback: usar el archivo directamente
-                logger.info("Usando archivo directamente sin extracción", filename=uploaded_file.filename)
-                await uploaded_file.seek(0)
-                audio_stream, filename = uploaded_file.file, uploaded_file.filename or "audio"
-
-            # Transcribir con OpenAI
-            logger.info("Enviando archivo a OpenAI para transcripción", filename=filename, model=model)
-            transcription = self._client.audio.transcriptions.create(model=model, file=(filename, audio_stream), response_format="text")
+            # Reservar un hilo de upload antes de extraer: así toda extracción en curso tiene un consumidor
+            # leyendo su stream y no retiene el semáforo de FFmpeg esperando un hilo libre
+            async with self._upload_slots:
+                # Extraer audio si es necesario (solo si se inyectó el servicio)
+                if self._audio_extraction_service:
+                    audio_stream, filename, content_type = await self._audio_extraction_service.extract_audio_stream(uploaded_file)
+                else:
+                    # Fallback: usar el archivo directamente
+                    audio_stream, filename, content_type = (
+                        upload_file_reader.open_upload(uploaded_file.file),
+                        uploaded_file.filename or "audio",
+                        uploaded_file.content_type or "application/octet-stream",
+                    )
+
+                # Transcribir con OpenAI. El SDK lee el stream de forma bloqueante mientras se sigue produciendo
+                # en el event loop, así que la llamada corre en el pool de hilos del adapter
+                logger.info(
+                    "Enviando archivo a OpenAI para transcripción",
+                    filename=uploaded_file.filename,
+                    audio_filename=filename,
+                    model=model,
+                    has_extraction_service=self._audio_extraction_service is not None,
+                )
+                try:
+                    transcription = await self._create_transcription_with_retries(model, filename, audio_stream, content_type)
+                finally:
+                    # Cerrar el stream libera al productor si el upload terminó antes de consumirlo completo
+                    audio_stream.close()
 
             logger.info("Transcripción de OpenAI completada", filename=filename, model=model, transcription_length=len(transcription))
 
             return str(transcription)
 
+        except openai.APIError as e:
+            if _is_audio_stream_error(e):
+                # Falló la lectura del audio, no OpenAI: quien lo produce (p. ej. FFmpeg) ya registró el detalle
+                logger.error(
+                    "Error leyendo el audio durante el envío a OpenAI",
+                    filename=uploaded_file.filename,
+                    model=model,
+                    error=str(e.__cause__),
+                    error_type=type(e.__cause__).__name__,
+                )
+                raise
+
+            # Errores de la API (incluidos los de conexión): el tipo y el status bastan, sin traceback
+            logger.error(
+                "Error de la API de OpenAI en transcripción",
+                filename=uploaded_file.filename,
+                model=model,
+                error=str(e),
+                error_type=type(e).__name__,
+                status_code=getattr(e, "status_code", None),
+            )
+            raise
+
+        except OSError as e:
+            logger.error(
+                "Error del sistema en transcripción",
+                filename=uploaded_file.filename,
+                model=model,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            raise
+
         except Exception as e:
-            logger.error("Error en transcripción de OpenAI", filename=uploaded_file.filename, model=model, error=str(e), exc_info=True)
+            logger.exception("Error inesperado en transcripción de OpenAI", filename=uploaded_file.filename, model=model, error=str(e))
             raise
+
+    def close(self) -> None:
+        """Libera el cliente HTTP y el pool de hilos del adapter."""
+        self._upload_executor.shutdown(wait=False, cancel_futures=True)
+        self._http_client.close()
+        logger.info("OpenAI adapter cerrado")
+
+    async def _create_transcription_with_retries(self, model: str, filename: str, audio_stream: BinaryIO, content_type: str) -> str:
+        """
+        Transcribe el audio reintentando ante errores transitorios, sin repetir la extracción.
+
+        Entre intentos rebobina el stream; si ya no se puede (p. ej. superó el buffer de reenvío), propaga el error.
+
+        Args:
+            model: Modelo a utilizar
+            filename: Nombre del archivo de audio
+            audio_stream: Stream con el audio
+            content_type: Content-Type del audio
+
+        Returns:
+            Texto transcrito del audio
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 1
+        while True:
+            try:
+                return await loop.run_in_executor(
+                    self._upload_executor, self._create_transcription, model, filename, audio_stream, content_type
+                )
+            except (openai.APIStatusError, openai.APIConnectionError) as e:
+                if attempt == _MAX_ATTEMPTS or not _is_transient(e) or not _rewind(audio_stream):
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning("Error transitorio de OpenAI, reintentando", filename=filename, attempt=attempt, delay=delay, error=str(e))
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _create_transcription(self, model: str, filename: str, audio_stream: BinaryIO, content_type: str) -> str:
+        """Llamada bloqueante al SDK de OpenAI; se ejecuta en el pool de hilos del adapter."""
+        return self._client.audio.transcriptions.create(model=model, file=(filename, audio_stream, content_type), response_format="text")
+
+
+def _is_transient(error: openai.APIError) -> bool:
+    """Indica si vale la pena reintentar un error de OpenAI; una falla al leer el stream de audio no lo es."""
+    if isinstance(error, openai.APIConnectionError):
+        return not _is_audio_stream_error(error)
+    if isinstance(error, openai.APIStatusError):
+        # Si OpenAI indica explícitamente si reintentar, se le hace caso
+        should_retry: str | None = error.response.headers.get("x-should-retry")
+        if should_retry in ("true", "false"):
+            return should_retry == "true"
+        return error.status_code in _RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def _is_audio_stream_error(error: openai.APIError) -> bool:
+    """
+    Indica si el error es una falla al leer el stream de audio, que el SDK reporta como APIConnectionError.
+
+    El SDK envuelve así cualquier excepción al enviar la solicitud (la original queda en `__cause__`), incluida una
+    del productor del audio (p. ej. FFmpeg terminó con error o la extracción fue cancelada); las de red son httpx.TransportError.
+    """
+    return (
+        isinstance(error, openai.APIConnectionError)
+        and error.__cause__ is not None
+        and not isinstance(error.__cause__, httpx.TransportError)
+    )
+
+
+def _retry_delay(error: openai.APIError, attempt: int) -> float:
+    """Segundos a esperar antes del siguiente intento: los que pide OpenAI, o backoff exponencial con jitter."""
+    if isinstance(error, openai.APIStatusError):
+        retry_after = _parse_retry_after(error.response.headers)
+        if retry_after is not None and 0 < retry_after <= _MAX_RETRY_AFTER:
+            return retry_after
+    delay = min(_INITIAL_RETRY_DELAY * 2.0 ** (attempt - 1), _MAX_RETRY_DELAY)
+    # Jitter de hasta un 25 % para que las solicitudes que fallaron juntas no reintenten a la vez
+    return delay * (1 - 0.25 * random.random())  # nosec B311
+
+
+def _parse_retry_after(headers: httpx.Headers) -> float | None:
+    """Lee la espera indicada por `retry-after-ms` o `retry-after` (segundos o fecha HTTP), o None si no la hay."""
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        try:
+            return float(headers[header]) / scale
+        except (KeyError, ValueError):
+            pass
+    retry_date = email.utils.parsedate_tz(headers.get("retry-after", ""))
+    return float(email.utils.mktime_tz(retry_date) - time.time()) if retry_date is not None else None
+
+
+def _rewind(audio_stream: BinaryIO) -> bool:
+    """Rebobina el stream para reenviarlo; retorna False si no es posible."""
+    try:
+        audio_stream.seek(0)
+    except OSError:
+        return False
+    return True
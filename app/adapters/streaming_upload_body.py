@@ -0,0 +1,206 @@
+import asyncio
+import collections
+import io
+import queue
+from typing import Any, Callable
+
+from app import ports
+
+# Bloques en vuelo entre el productor y el consumidor; acota la memoria por solicitud
+_MAX_PENDING_CHUNKS = 8
+
+# Bytes ya leídos que se conservan para poder rebobinar y reenviar el stream en un reintento.
+# Un audio mayor que el límite de Whisper sería rechazado igual, no tiene sentido reintentarlo
+_MAX_REPLAY_BYTES = ports.MAX_AUDIO_FILE_BYTES
+
+
+class StreamingUploadBody(io.RawIOBase):  # pylint: disable=too-many-instance-attributes
+    """
+    Stream de solo lectura alimentado por bloques mientras se consume.
+
+    El productor (p. ej. el drenado de stdout de FFmpeg) corre en el event loop: entrega bloques con
+    `await feed(...)` y cierra con `finish` o `fail`. El consumidor (el SDK de OpenAI, en un hilo)
+    lee con `read` bloqueante. La cola es acotada, así que el productor avanza al ritmo del upload.
+    Mientras lo leído no supere max_replay_bytes, `seek(0)` rebobina el stream para reenviarlo.
+    Debe crearse dentro del event loop del productor.
+    """
+
+    def __init__(self, max_pending_chunks: int = _MAX_PENDING_CHUNKS, max_replay_bytes: int = _MAX_REPLAY_BYTES) -> None:
+        """
+        Inicializa el stream.
+
+        Args:
+            max_pending_chunks: Máximo de bloques producidos que pueden esperar a ser leídos
+            max_replay_bytes: Máximo de bytes leídos que se conservan para rebobinar el stream
+        """
+        super().__init__()
+        self._loop = asyncio.get_running_loop()
+        self._space_available = asyncio.Event()
+        self._chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=max_pending_chunks)
+        self._pending = memoryview(b"")
+        self._position = 0
+        self._finished = False
+        self._error: BaseException | None = None
+        # Propio en lugar de `self.closed`, que pylint infiere como constante
+        self._closed = False
+        self._close_callbacks: list[Callable[[], object]] = []
+        # El resto del estado es el traspaso entre hilos y la posición de lectura, que feed/read/close coordinan juntos
+        self._replay = _ReplayBuffer(max_replay_bytes)
+
+    async def feed(self, chunk: bytes) -> None:
+        """Entrega un bloque al consumidor, esperando sin bloquear el loop mientras la cola esté llena."""
+        while True:
+            if self._closed:
+                raise BrokenPipeError("El consumidor cerró el stream")
+            try:
+                self._chunks.put_nowait(chunk)
+                return
+            except queue.Full:
+                # El consumidor avisa vía call_soon_threadsafe, que siempre corre después de este clear
+                self._space_available.clear()
+                await self._space_available.wait()
+
+    def finish(self) -> None:
+        """Marca el fin del stream; no bloquea."""
+        self._finished = True
+        self._wake_consumer()
+
+    def fail(self, error: BaseException) -> None:
+        """Propaga un error del productor al consumidor en su próxima lectura; no bloquea."""
+        self._error = error
+        self._wake_consumer()
+
+    def add_close_callback(self, callback: Callable[[], object]) -> None:
+        """Registra una función a ejecutar en el event loop cuando el consumidor cierre el stream."""
+        self._close_callbacks.append(callback)
+
+    def readable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # httpx rebobina el archivo antes de cada envío; solo se admite volver al inicio
+        if offset == 0 and whence == io.SEEK_CUR:
+            return self._position
+        if offset == 0 and whence == io.SEEK_SET:
+            if self._position == 0:
+                return 0
+            self._replay.rewind()
+            self._pending = memoryview(b"")
+            self._position = 0
+            return 0
+        raise io.UnsupportedOperation("seek")
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._pending:
+            chunk = self._next_chunk()
+            if not chunk:
+                return 0
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        # Despertar a un productor esperando en `feed`, que verá el stream cerrado
+        if self._closed:
+            return
+        self._closed = True
+        super().close()
+        while True:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                break
+        self._notify_space_available()
+        # Y a un consumidor bloqueado en otro hilo, que fallará en lugar de esperar bloques que ya no llegarán
+        self._wake_consumer()
+        self._replay.discard()
+        for callback in self._close_callbacks:
+            self._call_in_loop(callback)
+
+    def _next_chunk(self) -> bytes:
+        """Obtiene el siguiente bloque, o b"" al terminar el stream."""
+        chunk = self._replay.next_reread()
+        if chunk is None:
+            chunk = self._receive_chunk()
+            self._replay.record(chunk)
+        return chunk
+
+    def _receive_chunk(self) -> bytes:
+        """Espera el siguiente bloque del productor, o b"" al terminar el stream."""
+        while True:
+            if self._closed:
+                raise ValueError("Lectura de un stream cerrado")
+            if self._error is not None:
+                raise self._error
+            # Leer la bandera antes que la cola: si ya estaba terminado y la cola está vacía, no hay más datos
+            finished = self._finished
+            try:
+                chunk = self._chunks.get_nowait()
+            except queue.Empty:
+                if finished:
+                    return b""
+                chunk = self._chunks.get()
+            self._notify_space_available()
+            # None es solo una señal para volver a revisar el estado
+            if chunk:
+                return chunk
+
+    def _notify_space_available(self) -> None:
+        """Despierta al productor desde el hilo consumidor."""
+        self._call_in_loop(self._space_available.set)
+
+    def _call_in_loop(self, callback: Callable[[], object]) -> None:
+        """Programa una función en el event loop del productor desde cualquier hilo."""
+        try:
+            self._loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            # El loop ya fue cerrado; no queda productor que notificar
+            pass
+
+    def _wake_consumer(self) -> None:
+        """Despierta a un consumidor bloqueado esperando la cola."""
+        try:
+            self._chunks.put_nowait(None)
+        except queue.Full:
+            # Con la cola llena el consumidor no está bloqueado y revisará el estado en su próxima lectura
+            pass
+
+
+class _ReplayBuffer:
+    """Bloques ya entregados al consumidor, conservados para releerlos tras rebobinar el stream."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        # None si lo entregado superó el máximo y ya no se puede reenviar
+        self._chunks: list[bytes] | None = []
+        self._size = 0
+        self._rereading: collections.deque[bytes] = collections.deque()
+
+    def record(self, chunk: bytes) -> None:
+        """Guarda un bloque recién entregado, o libera lo guardado si se supera el máximo."""
+        if not chunk or self._chunks is None:
+            return
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size > self._max_bytes:
+            # Demasiado grande para reenviarlo: liberar lo guardado
+            self.discard()
+
+    def next_reread(self) -> bytes | None:
+        """Devuelve el siguiente bloque a releer, o None si no queda ninguno."""
+        return self._rereading.popleft() if self._rereading else None
+
+    def rewind(self) -> None:
+        """Vuelve a entregar desde el inicio todos los bloques guardados."""
+        if self._chunks is None:
+            raise OSError("El stream superó el máximo de bytes reenviables y no se puede rebobinar")
+        self._rereading = collections.deque(self._chunks)
+
+    def discard(self) -> None:
+        """Libera lo guardado; el stream deja de poder rebobinarse."""
+        self._chunks = None
+        self._rereading.clear()
@@ -0,0 +1,64 @@
+import io
+from typing import Any, BinaryIO, cast
+
+
+class UploadFileReader(io.RawIOBase):
+    """
+    Vista de solo lectura sobre el archivo de un upload, para entregarlo al SDK de OpenAI.
+
+    No expone `fileno`: httpx lo consulta para calcular el Content-Length y en un
+    SpooledTemporaryFile eso fuerza el volcado a disco de un upload que estaba en memoria.
+    Sin `fileno`, httpx obtiene la longitud con seek/tell y lee el archivo por bloques.
+    Cerrar el lector no cierra el archivo subyacente, que sigue perteneciendo al upload.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        """
+        Inicializa el lector.
+
+        Args:
+            file: Archivo del upload (normalmente un SpooledTemporaryFile)
+        """
+        super().__init__()
+        self._file = file
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self._file.read(-1 if size is None else size)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._file.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def open_upload(file: BinaryIO) -> BinaryIO:
+    """
+    Abre el archivo de un upload para enviarlo, sin copiar su contenido ni mover la posición del original.
+
+    Si el upload sigue en memoria (el SpooledTemporaryFile no se volcó a disco), retorna un BytesIO que comparte
+    el mismo buffer: CPython no copia los bytes en `getvalue` ni al crear el BytesIO. Si no, retorna un UploadFileReader.
+    En ambos casos httpx rebobina el stream antes de enviarlo.
+
+    Args:
+        file: Archivo del upload
+
+    Returns:
+        Stream de solo lectura con el contenido del upload
+    """
+    # Antes del volcado, el archivo interno de un SpooledTemporaryFile es un BytesIO
+    buffer = getattr(file, "_file", None)
+    if isinstance(buffer, io.BytesIO):
+        return cast(BinaryIO, io.BytesIO(buffer.getvalue()))
+    return cast(BinaryIO, UploadFileReader(file))
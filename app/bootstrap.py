@@ -39,12 +39,24 @@ def bootstrap_app() -> FastAPI:
 
     # Crear adapter de extracción de audio
     logger.info("Creando adapter de extracción de audio")
-    audio_extraction_adapter = ffmpeg_audio_extraction_adapter.FFmpegAudioExtractionAdapter()
+    workers = int(os.getenv("WORKERS") or 1)
+    ffmpeg_concurrency = os.getenv("FFMPEG_CONCURRENCY")
+    if ffmpeg_concurrency:
+        max_concurrency = int(ffmpeg_concurrency)
+    else:
+        # El cupo es por proceso: repartir la mitad de los núcleos entre los workers de uvicorn, con al menos uno por worker
+        max_concurrency = max(1, (os.cpu_count() or 2) // 2 // workers)
+    audio_extraction_adapter = ffmpeg_audio_extraction_adapter.FFmpegAudioExtractionAdapter(
+        max_concurrency=max_concurrency, temp_dir=os.getenv("FFMPEG_TEMP_DIR")
+    )
 
     # Crear adapter de transcripción con extracción de audio inyectada
     logger.info("Creando adapter de transcripción OpenAI")
+    # Los hilos y conexiones de upload también se reparten entre los workers, sin bajar del cupo de FFmpeg:
+    # cada extracción en curso necesita un hilo que consuma su audio
+    max_concurrent_uploads = max(max_concurrency, openai_transcription_adapter.MAX_CONCURRENT_UPLOADS // workers)
     transcription_adapter = openai_transcription_adapter.OpenAITranscriptionAdapter(
-        api_key=openai_api_key, audio_extraction_service=audio_extraction_adapter
+        api_key=openai_api_key, audio_extraction_service=audio_extraction_adapter, max_concurrent_uploads=max_concurrent_uploads
     )
 
     # Crear service manager con dependencias inyectadas
@@ -53,7 +65,10 @@ def bootstrap_app() -> FastAPI:
 
     # Crear y retornar la aplicación FastAPI
     logger.info("Creando aplicación FastAPI")
-    app = fastapi_app.create_app(service_manager)
+    max_upload_bytes = os.getenv("MAX_UPLOAD_BYTES")
+    app = fastapi_app.create_app(
+        service_manager, max_upload_bytes=int(max_upload_bytes) if max_upload_bytes else fastapi_app.MAX_UPLOAD_BYTES
+    )
 
     logger.info("Bootstrap completado exitosamente")
     return app
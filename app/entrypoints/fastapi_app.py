@@ -1,46 +1,71 @@
+import contextlib
+from collections.abc import AsyncIterator
 from typing import Annotated
 
-from fastapi import Depends, FastAPI, File, Form, UploadFile
+from fastapi import FastAPI, File, Form, UploadFile
 from fastapi.responses import JSONResponse
+from starlette import formparsers
 
+from app import ports
 from app.config.logger import get_logger
 from app.entrypoints import dtos
+from app.entrypoints import upload_validation
 from app.service import manager
 
 logger = get_logger(__name__)
 
+# Umbral bajo el cual Starlette mantiene cada archivo subido en memoria en vez de volcarlo a disco.
+# Con el límite de Whisper, los audios que se envían directo nunca pasan por /tmp
+_UPLOAD_SPOOL_MAX_SIZE = ports.MAX_AUDIO_FILE_BYTES
 
-def create_app(service_manager: manager.ServiceManager) -> FastAPI:
+# Tamaño máximo por defecto del cuerpo de una solicitud de transcripción
+MAX_UPLOAD_BYTES = 500 * 1024 * 1024
+
+
+def create_app(service_manager: manager.ServiceManager, max_upload_bytes: int = MAX_UPLOAD_BYTES) -> FastAPI:
     """
     Crea la aplicación FastAPI con las dependencias inyectadas.
 
     Args:
         service_manager: Gestor de servicios inyectado
+        max_upload_bytes: Tamaño máximo del cuerpo de una solicitud de transcripción en bytes
 
     Returns:
         Aplicación FastAPI configurada
     """
     logger.info("Creando aplicación FastAPI")
 
+    # Starlette no expone esta configuración por aplicación; se ajusta a nivel de clase
+    formparsers.MultiPartParser.spool_max_size = _UPLOAD_SPOOL_MAX_SIZE
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        """Cierra los servicios (conexiones a OpenAI, hilos) al apagar la aplicación."""
+        yield
+        service_manager.close()
+
     app = FastAPI(
-        title="Video Transcriber API", description="API para transcribir archivos de audio y video usando OpenAI Whisper", version="1.0.0"
+        title="Video Transcriber API",
+        description="API para transcribir archivos de audio y video usando OpenAI Whisper",
+        version="1.0.0",
+        lifespan=lifespan,
     )
 
-    logger.info("Aplicación FastAPI creada exitosamente")
+    # Rechazar uploads demasiado grandes o que no son audio/video antes de que FastAPI los vuelque a disco
+    app.add_middleware(
+        upload_validation.UploadValidationMiddleware, path="/transcribe", field_name="file", max_upload_bytes=max_upload_bytes
+    )
 
-    def get_service_manager() -> manager.ServiceManager:
-        """Dependency provider para el ServiceManager."""
-        return service_manager
+    logger.info("Aplicación FastAPI creada exitosamente", max_upload_bytes=max_upload_bytes)
 
     @app.post(
         "/transcribe",
         response_model=dtos.TranscriptionResponse,
-        responses={400: {"model": dtos.ErrorResponse}, 500: {"model": dtos.ErrorResponse}},
+        responses={413: {"model": dtos.ErrorResponse}, 415: {"model": dtos.ErrorResponse}, 500: {"model": dtos.ErrorResponse}},
     )
     async def transcribe_media(
         file: Annotated[UploadFile, File(description="Archivo de audio o video a transcribir")],
         model: Annotated[str, Form(description="Modelo de OpenAI a utilizar")] = "whisper-1",
-        service_manager: manager.ServiceManager = Depends(get_service_manager),
     ) -> dtos.TranscriptionResponse | JSONResponse:
         """
         Transcribe un archivo de audio o video a texto.
@@ -48,7 +73,6 @@ def create_app(service_manager: manager.ServiceManager) -> FastAPI:
         Args:
             file: Archivo de audio/video subido
             model: Modelo de OpenAI a utilizar
-            service_manager: Gestor de servicios inyectado
 
         Returns:
             Respuesta con la transcripción o error
@@ -57,13 +81,13 @@ def create_app(service_manager: manager.ServiceManager) -> FastAPI:
             "Recibida solicitud de transcripción", filename=file.filename, content_type=file.content_type, model=model, file_size=file.size
         )
 
-        # Validar tipo de archivo
-        if not file.content_type or not file.content_type.startswith(("audio/", "video/")):
+        # Validar tipo de archivo; el middleware ya lo hace antes de leer el cuerpo, salvo si no alcanzó a ver la parte del archivo
+        if not upload_validation.is_media_content_type(file.content_type):
             logger.warning("Archivo rechazado por tipo de contenido inválido", filename=file.filename, content_type=file.content_type)
-            return {"msg": "El archivo debe ser de tipo audio o video"}, 400
+            return JSONResponse(status_code=415, content=dtos.ErrorResponse(error="El archivo debe ser de tipo audio o video").model_dump())
 
         try:
-            # Transcribir directamente desde el archivo subido
+            # Transcribir directamente desde el archivo subido; service_manager llega por closure desde create_app
             transcription = await service_manager.transcribe_media(uploaded_file=file, model=model)
 
             logger.info(
@@ -76,7 +100,14 @@ def create_app(service_manager: manager.ServiceManager) -> FastAPI:
             return dtos.TranscriptionResponse(transcription=transcription)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Error procesando solicitud de transcripción", filename=file.filename, model=model, error=str(e), exc_info=True)
+            # El servicio de transcripción ya registró el detalle (y el traceback si el error era inesperado)
+            logger.error(
+                "Error procesando solicitud de transcripción",
+                filename=file.filename,
+                model=model,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
             return JSONResponse(status_code=500, content=dtos.ErrorResponse(error="Error interno del servidor").model_dump())
 
     @app.get("/health")
@@ -0,0 +1,200 @@
+import re
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.logger import get_logger
+from app.entrypoints import dtos
+
+logger = get_logger(__name__)
+
+# Bytes del cuerpo que se inspeccionan como máximo buscando los encabezados de la parte del archivo.
+# Los campos que el cliente envíe antes (p. ej. `model`) son pequeños; si no aparece en este margen, valida el endpoint
+_MAX_PEEK_BYTES = 64 * 1024
+
+_BOUNDARY_PATTERN = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_FIELD_NAME_PATTERN = re.compile(rb'\bname="([^"]*)"', re.IGNORECASE)
+
+_MEDIA_CONTENT_TYPE_PREFIXES = ("audio/", "video/")
+
+
+def is_media_content_type(content_type: str | None) -> bool:
+    """Indica si un Content-Type corresponde a audio o video."""
+    return content_type is not None and content_type.lower().startswith(_MEDIA_CONTENT_TYPE_PREFIXES)
+
+
+class UploadValidationMiddleware:
+    """
+    Middleware ASGI que rechaza uploads inválidos antes de que FastAPI lea el cuerpo multipart.
+
+    Responde 413 si el Content-Length declarado supera el límite y 415 si la parte del archivo no es audio ni video,
+    leyendo solo los primeros bloques del cuerpo, que luego se reenvían intactos a la aplicación.
+    Sin Content-Length (transferencia por chunks), el límite se aplica mientras la aplicación consume el cuerpo.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, field_name: str, max_upload_bytes: int) -> None:
+        """
+        Inicializa el middleware.
+
+        Args:
+            app: Aplicación ASGI envuelta
+            path: Ruta del endpoint de upload a validar (solo POST)
+            field_name: Nombre del campo multipart que contiene el archivo
+            max_upload_bytes: Tamaño máximo del cuerpo de la solicitud en bytes
+        """
+        self._app = app
+        self._path = path
+        self._field_name = field_name.encode("utf-8")
+        self._max_upload_bytes = max_upload_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self._path:
+            await self._app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self._max_upload_bytes:
+            logger.warning("Upload rechazado por tamaño", content_length=int(content_length), max_upload_bytes=self._max_upload_bytes)
+            await _error_response(413, "El archivo supera el tamaño máximo permitido")(scope, receive, send)
+            return
+
+        boundary_match = _BOUNDARY_PATTERN.search(headers.get("content-type", ""))
+        if boundary_match is None:
+            # No es multipart: FastAPI responde con el error de validación correspondiente
+            await self._app(scope, receive, send)
+            return
+
+        peeked, body, part_found, part_content_type = await _peek_file_part(receive, boundary_match.group(1), self._field_name)
+        if part_found and not is_media_content_type(part_content_type):
+            logger.warning("Upload rechazado por tipo de contenido inválido", content_type=part_content_type)
+            await _error_response(415, "El archivo debe ser de tipo audio o video")(scope, receive, send)
+            return
+
+        if content_length is None and len(body) > self._max_upload_bytes:
+            logger.warning("Upload rechazado por tamaño", received=len(body), max_upload_bytes=self._max_upload_bytes)
+            await _error_response(413, "El archivo supera el tamaño máximo permitido")(scope, receive, send)
+            return
+
+        replay_receive = _ReplayReceive(receive, peeked, self._max_upload_bytes if content_length is None else None)
+        response_started = False
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if replay_receive.exceeded and not response_started:
+                # FastAPI convierte el error al leer el cuerpo en su propio 400: se descarta para responder el 413
+                return
+            response_started = True
+            await send(message)
+
+        try:
+            await self._app(scope, replay_receive, guarded_send)
+        except _UploadTooLarge:
+            if response_started:
+                raise
+        if replay_receive.exceeded and not response_started:
+            await _error_response(413, "El archivo supera el tamaño máximo permitido")(scope, receive, send)
+
+
+class _UploadTooLarge(Exception):
+    """El cuerpo recibido por chunks superó el tamaño máximo permitido."""
+
+
+class _ReplayReceive:
+    """
+    Receive ASGI que reenvía primero los mensajes ya inspeccionados y luego los del cliente.
+
+    Con max_bytes, corta con `_UploadTooLarge` el cuerpo que lo supere y lo deja indicado en `exceeded`.
+    """
+
+    def __init__(self, receive: Receive, peeked: list[Message], max_bytes: int | None) -> None:
+        self._receive = receive
+        self._peeked = peeked
+        self._max_bytes = max_bytes
+        self._received = sum(len(message.get("body", b"")) for message in peeked)
+        self.exceeded = False
+
+    async def __call__(self) -> Message:
+        if self._peeked:
+            return self._peeked.pop(0)
+        message = await self._receive()
+        if self._max_bytes is not None and message["type"] == "http.request":
+            self._received += len(message.get("body", b""))
+            if self._received > self._max_bytes:
+                logger.warning("Upload rechazado por tamaño", received=self._received, max_upload_bytes=self._max_bytes)
+                self.exceeded = True
+                raise _UploadTooLarge()
+        return message
+
+
+async def _peek_file_part(receive: Receive, boundary: str, field_name: bytes) -> tuple[list[Message], bytearray, bool, str | None]:
+    """
+    Lee el cuerpo solo hasta los encabezados de la parte del archivo, guardando los mensajes para reenviarlos.
+
+    Args:
+        receive: Canal ASGI del que se leen los mensajes del cuerpo
+        boundary: Boundary multipart declarado en el Content-Type
+        field_name: Nombre del campo que contiene el archivo
+
+    Returns:
+        Tupla con (mensajes_leídos, cuerpo_leído, encontrada, content_type) de la parte del archivo
+    """
+    delimiter = b"--" + boundary.encode("latin-1")
+    peeked: list[Message] = []
+    body = bytearray()
+    part_found, part_content_type = False, None
+    while not part_found and len(body) < _MAX_PEEK_BYTES:
+        message = await receive()
+        peeked.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        part_found, part_content_type = _find_part_content_type(body, delimiter, field_name)
+        if not message.get("more_body", False):
+            break
+    return peeked, body, part_found, part_content_type
+
+
+def _find_part_content_type(body: bytes | bytearray, delimiter: bytes, field_name: bytes) -> tuple[bool, str | None]:
+    """
+    Busca los encabezados de una parte multipart por nombre de campo.
+
+    Args:
+        body: Inicio del cuerpo multipart
+        delimiter: Delimitador de partes (`--` seguido del boundary)
+        field_name: Nombre del campo buscado
+
+    Returns:
+        Tupla con (encontrada, content_type); content_type es None si la parte no lo declara
+    """
+    position = body.find(delimiter)
+    while position != -1:
+        headers_start = position + len(delimiter) + 2
+        headers_end = body.find(b"\r\n\r\n", headers_start)
+        if headers_end == -1:
+            # Encabezados incompletos: hace falta más cuerpo
+            return False, None
+
+        content_type = None
+        name = None
+        for line in bytes(body[headers_start:headers_end]).split(b"\r\n"):
+            header, _, value = line.partition(b":")
+            header = header.strip().lower()
+            if header == b"content-disposition":
+                name_match = _FIELD_NAME_PATTERN.search(value)
+                name = name_match.group(1) if name_match else None
+            elif header == b"content-type":
+                content_type = value.strip().decode("latin-1")
+        if name == field_name:
+            return True, content_type
+
+        position = body.find(b"\r\n" + delimiter, headers_end)
+        if position != -1:
+            position += 2
+    return False, None
+
+
+def _error_response(status_code: int, error: str) -> JSONResponse:
+    """Construye la respuesta de error con el formato de la API."""
+    return JSONResponse(status_code=status_code, content=dtos.ErrorResponse(error=error).model_dump())
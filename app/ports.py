@@ -1,13 +1,14 @@
-from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Protocol
 
 from fastapi import UploadFile
 
+# Tamaño máximo del archivo de audio que acepta Whisper (25 MB)
+MAX_AUDIO_FILE_BYTES = 25 * 1024 * 1024
 
-class TranscriptionService(ABC):
+
+class TranscriptionService(Protocol):
     """Puerto para el servicio de transcripción de audio/video."""
 
-    @abstractmethod
     async def transcribe_from_upload(self, uploaded_file: UploadFile, model: str = "whisper-1") -> str:
         """
         Transcribe un archivo subido (audio o video) a texto.
@@ -19,14 +20,15 @@ class TranscriptionService(ABC):
         Returns:
             Texto transcrito del archivo
         """
-        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera los recursos del servicio (conexiones, hilos) al apagar la aplicación."""
 
 
-class AudioExtractionService(ABC):
+class AudioExtractionService(Protocol):
     """Puerto para el servicio de extracción de audio."""
 
-    @abstractmethod
-    async def extract_audio_stream(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str]:
+    async def extract_audio_stream(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str, str]:
         """
         Extrae audio de un archivo de video/audio y retorna un stream.
 
@@ -34,6 +36,5 @@ class AudioExtractionService(ABC):
             uploaded_file: Archivo subido por el usuario
 
         Returns:
-            Tupla con (stream_de_audio, nombre_archivo)
+            Tupla con (stream_de_audio, nombre_archivo, content_type)
         """
-        raise NotImplementedError
@@ -43,3 +43,7 @@ class ServiceManager:
         logger.info("Transcripción completada exitosamente", filename=uploaded_file.filename, model=model, transcription_length=len(result))
 
         return result
+
+    def close(self) -> None:
+        """Libera los recursos de los servicios gestionados."""
+        self._transcription_service.close()
@@ -1,16 +1,24 @@
-import uvicorn
+import os
 
-from app.bootstrap import bootstrap_app
+import uvicorn
+from dotenv import load_dotenv
 
 
 def main() -> None:
     """Punto de entrada principal de la aplicación."""
-    app = bootstrap_app()
+    load_dotenv()
+    # Cada worker ejecuta al menos un FFmpeg de 2 hilos: con la mitad de los núcleos se ocupa la CPU sin sobresuscribirla
+    workers = int(os.getenv("WORKERS") or max(1, (os.cpu_count() or 2) // 2))
+    # Cada worker ejecuta bootstrap_app en su propio proceso y hereda el entorno: así reparte el cupo de FFmpeg
+    os.environ["WORKERS"] = str(workers)
     uvicorn.run(
-        app,
+        "app.bootstrap:bootstrap_app",
+        factory=True,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         host="0.0.0.0",  # nosec B104
         port=8000,
-        # reload=True
     )
 
 
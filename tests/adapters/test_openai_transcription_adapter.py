@@ -0,0 +1,124 @@
+import io
+import unittest
+from typing import Any, BinaryIO, cast
+from unittest import mock
+
+import httpx
+import openai
+import structlog
+from fastapi import UploadFile
+
+from app import ports
+from app.adapters import openai_transcription_adapter
+
+
+class TranscriptionRetryTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.responses: list[httpx.Response] = []
+        self.requests = 0
+        self.adapter = self._create_adapter()
+
+    def tearDown(self) -> None:
+        self.adapter.close()
+
+    def _create_adapter(
+        self, audio_extraction_service: ports.AudioExtractionService | None = None
+    ) -> openai_transcription_adapter.OpenAITranscriptionAdapter:
+        adapter = openai_transcription_adapter.OpenAITranscriptionAdapter(api_key="test", audio_extraction_service=audio_extraction_service)
+        adapter._client = openai.OpenAI(  # pylint: disable=protected-access
+            api_key="test", http_client=httpx.Client(transport=httpx.MockTransport(self._handle)), max_retries=0
+        )
+        return adapter
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        assert b"audio-bytes" in request.read()
+        return self.responses.pop(0)
+
+    async def test_audio_stream_failure_is_not_retried_and_logged_as_such(self) -> None:
+        self.adapter.close()
+        self.adapter = self._create_adapter(_FailingExtraction())
+        sleep = mock.AsyncMock()
+
+        with structlog.testing.capture_logs() as logs, self.assertRaises(openai.APIConnectionError):
+            await self._transcribe(sleep)
+        sleep.assert_not_awaited()
+        self.assertIn(
+            {"event": "Error leyendo el audio durante el envío a OpenAI", "error_type": "BrokenPipeError"},
+            [{"event": log["event"], "error_type": log.get("error_type")} for log in logs if log["log_level"] == "error"],
+        )
+
+    async def _transcribe(self, sleep: mock.AsyncMock) -> str:
+        uploaded_file = UploadFile(io.BytesIO(b"audio-bytes"), filename="audio.mp3")
+        with mock.patch("asyncio.sleep", sleep):
+            return await self.adapter.transcribe_from_upload(uploaded_file)
+
+    async def test_retry_after_header_sets_the_delay(self) -> None:
+        self.responses = [_error(429, {"retry-after": "20"}), httpx.Response(200, text="hola")]
+        sleep = mock.AsyncMock()
+
+        self.assertEqual(await self._transcribe(sleep), "hola")
+        sleep.assert_awaited_once_with(20.0)
+
+    async def test_retry_after_ms_header_sets_the_delay(self) -> None:
+        self.responses = [_error(503, {"retry-after-ms": "1500"}), httpx.Response(200, text="hola")]
+        sleep = mock.AsyncMock()
+
+        self.assertEqual(await self._transcribe(sleep), "hola")
+        sleep.assert_awaited_once_with(1.5)
+
+    async def test_backoff_without_retry_after_has_jitter(self) -> None:
+        self.responses = [_error(408), _error(500), httpx.Response(200, text="hola")]
+        sleep = mock.AsyncMock()
+
+        self.assertEqual(await self._transcribe(sleep), "hola")
+        first_delay, second_delay = (call.args[0] for call in sleep.await_args_list)
+        self.assertTrue(0.375 <= first_delay <= 0.5)
+        self.assertTrue(0.75 <= second_delay <= 1.0)
+
+    async def test_should_retry_header_false_is_not_retried(self) -> None:
+        self.responses = [_error(500, {"x-should-retry": "false"})]
+
+        with self.assertRaises(openai.InternalServerError):
+            await self._transcribe(mock.AsyncMock())
+        self.assertEqual(self.requests, 1)
+
+    async def test_should_retry_header_true_is_retried(self) -> None:
+        self.responses = [_error(400, {"x-should-retry": "true"}), httpx.Response(200, text="hola")]
+
+        self.assertEqual(await self._transcribe(mock.AsyncMock()), "hola")
+        self.assertEqual(self.requests, 2)
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        self.responses = [_error(400)]
+
+        with self.assertRaises(openai.BadRequestError):
+            await self._transcribe(mock.AsyncMock())
+        self.assertEqual(self.requests, 1)
+
+    async def test_gives_up_after_max_attempts(self) -> None:
+        self.responses = [_error(500), _error(502), _error(503)]
+
+        with self.assertRaises(openai.InternalServerError):
+            await self._transcribe(mock.AsyncMock())
+        self.assertEqual(self.requests, 3)
+
+
+class _FailingExtraction:
+    """Extracción cuyo stream de audio falla durante el upload, como cuando FFmpeg termina con error."""
+
+    async def extract_audio_stream(self, uploaded_file: UploadFile) -> tuple[BinaryIO, str, str]:
+        return cast(BinaryIO, _FailingStream()), uploaded_file.filename or "audio.mp3", "audio/mpeg"
+
+
+class _FailingStream(io.RawIOBase):
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        raise BrokenPipeError("La extracción de audio falló")
+
+
+def _error(status_code: int, headers: dict[str, str] | None = None) -> httpx.Response:
+    """Respuesta de error con el formato de la API de OpenAI."""
+    return httpx.Response(status_code, headers=headers, json={"error": {"message": "error"}})
@@ -0,0 +1,102 @@
+import asyncio
+import io
+import unittest
+
+from app.adapters import streaming_upload_body
+
+
+class StreamingUploadBodyTest(unittest.IsolatedAsyncioTestCase):
+    async def test_read_returns_fed_chunks_until_finish(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+        await stream.feed(b"hola ")
+        await stream.feed(b"mundo")
+        stream.finish()
+
+        self.assertEqual(stream.read(), b"hola mundo")
+        self.assertEqual(stream.read(), b"")
+
+    async def test_read_waits_for_producer(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+        reading = asyncio.create_task(asyncio.to_thread(stream.read))
+
+        await asyncio.sleep(0.05)
+        await stream.feed(b"audio")
+        stream.finish()
+
+        self.assertEqual(await asyncio.wait_for(reading, timeout=1), b"audio")
+
+    async def test_feed_waits_while_queue_is_full(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody(max_pending_chunks=1)
+        await stream.feed(b"a")
+        feeding = asyncio.create_task(stream.feed(b"b"))
+
+        await asyncio.sleep(0.05)
+        self.assertFalse(feeding.done())
+
+        self.assertEqual(stream.read(1), b"a")
+        await asyncio.wait_for(feeding, timeout=1)
+        self.assertEqual(stream.read(1), b"b")
+
+    async def test_fail_raises_in_consumer(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+        reading = asyncio.create_task(asyncio.to_thread(stream.read))
+
+        await asyncio.sleep(0.05)
+        stream.fail(RuntimeError("FFmpeg falló"))
+
+        with self.assertRaisesRegex(RuntimeError, "FFmpeg falló"):
+            await asyncio.wait_for(reading, timeout=1)
+
+    async def test_close_wakes_blocked_consumer(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+        reading = asyncio.create_task(asyncio.to_thread(stream.read))
+
+        await asyncio.sleep(0.05)
+        stream.close()
+
+        with self.assertRaises(ValueError):
+            await asyncio.wait_for(reading, timeout=1)
+
+    async def test_close_releases_producer_and_runs_callbacks(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody(max_pending_chunks=1)
+        closed = asyncio.Event()
+        stream.add_close_callback(closed.set)
+        await stream.feed(b"a")
+        feeding = asyncio.create_task(stream.feed(b"b"))
+
+        await asyncio.sleep(0.05)
+        stream.close()
+
+        with self.assertRaises(BrokenPipeError):
+            await asyncio.wait_for(feeding, timeout=1)
+        await asyncio.wait_for(closed.wait(), timeout=1)
+
+    async def test_seek_start_replays_read_chunks(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+        await stream.feed(b"abc")
+        await stream.feed(b"def")
+        self.assertEqual(stream.read(4), b"abc")
+        self.assertEqual(stream.read(4), b"def")
+        self.assertEqual(stream.tell(), 6)
+
+        await stream.feed(b"ghi")
+        stream.finish()
+
+        self.assertEqual(stream.seek(0), 0)
+        self.assertEqual(stream.read(), b"abcdefghi")
+
+    async def test_seek_start_fails_after_max_replay_bytes(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody(max_replay_bytes=4)
+        await stream.feed(b"abc")
+        await stream.feed(b"def")
+        stream.finish()
+        self.assertEqual(stream.read(), b"abcdef")
+
+        with self.assertRaises(OSError):
+            stream.seek(0)
+
+    async def test_seek_only_supports_start(self) -> None:
+        stream = streaming_upload_body.StreamingUploadBody()
+
+        with self.assertRaises(io.UnsupportedOperation):
+            stream.seek(1)
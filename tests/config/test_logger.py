@@ -0,0 +1,15 @@
+import unittest
+
+from app.config import logger
+
+
+class OrjsonDumpsTest(unittest.TestCase):
+    def test_serializes_non_str_keys_like_json_dumps(self) -> None:
+        rendered = logger._orjson_dumps({"event": "evento", "counts": {1: "a", None: 2}})  # pylint: disable=protected-access
+
+        self.assertEqual(rendered, '{"event":"evento","counts":{"1":"a","null":2}}')
+
+    def test_uses_default_for_unserializable_values(self) -> None:
+        rendered = logger._orjson_dumps({"event": "evento", "value": {1, 2}}, default=sorted)  # pylint: disable=protected-access
+
+        self.assertEqual(rendered, '{"event":"evento","value":[1,2]}')
@@ -0,0 +1,135 @@
+import unittest
+from collections.abc import Iterator
+
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from app.entrypoints import fastapi_app
+from app.service import manager
+
+_BOUNDARY = "test-boundary"
+_MULTIPART_CONTENT_TYPE = f"multipart/form-data; boundary={_BOUNDARY}"
+_MAX_UPLOAD_BYTES = 256 * 1024
+
+_TOO_LARGE = {"success": False, "error": "El archivo supera el tamaño máximo permitido"}
+_NOT_MEDIA = {"success": False, "error": "El archivo debe ser de tipo audio o video"}
+
+
+class _FakeTranscriptionService:
+    """Servicio de transcripción que responde con el nombre y el tamaño del archivo recibido."""
+
+    async def transcribe_from_upload(self, uploaded_file: UploadFile, model: str = "whisper-1") -> str:
+        return f"{uploaded_file.filename}:{len(await uploaded_file.read())}:{model}"
+
+    def close(self) -> None:
+        pass
+
+
+class UploadValidationMiddlewareTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = fastapi_app.create_app(manager.ServiceManager(_FakeTranscriptionService()), max_upload_bytes=_MAX_UPLOAD_BYTES)
+        self.client = TestClient(self.app)
+
+    def _post(self, body: bytes | Iterator[bytes]) -> tuple[int, dict[str, object]]:
+        response = self.client.post("/transcribe", content=body, headers={"content-type": _MULTIPART_CONTENT_TYPE})
+        return response.status_code, response.json()
+
+    def test_accepts_media_file_part_after_model_field(self) -> None:
+        body = _multipart(_field("model", b"whisper-1"), _file_part(b"audio" * 100, "audio/mpeg"))
+
+        self.assertEqual(self._post(body), (200, {"transcription": "audio.mp3:500:whisper-1", "success": True}))
+
+    def test_rejects_non_media_file_part_after_model_field(self) -> None:
+        body = _multipart(_field("model", b"whisper-1"), _file_part(b"\x89PNG", "image/png"))
+
+        self.assertEqual(self._post(body), (415, _NOT_MEDIA))
+
+    def test_rejects_file_part_without_content_type(self) -> None:
+        body = _multipart(_file_part(b"audio", None))
+
+        self.assertEqual(self._post(body), (415, _NOT_MEDIA))
+
+    def test_file_part_past_peek_window_is_validated_by_endpoint(self) -> None:
+        padding = _field("padding", b"x" * (70 * 1024))
+
+        accepted = _multipart(padding, _file_part(b"audio" * 100, "audio/mpeg"))
+        self.assertEqual(self._post(accepted), (200, {"transcription": "audio.mp3:500:whisper-1", "success": True}))
+
+        rejected = _multipart(padding, _file_part(b"\x89PNG", "image/png"))
+        self.assertEqual(self._post(rejected), (415, _NOT_MEDIA))
+
+    def test_rejects_declared_content_length_over_limit(self) -> None:
+        body = _multipart(_file_part(b"a" * (_MAX_UPLOAD_BYTES + 1), "audio/mpeg"))
+
+        self.assertEqual(self._post(body), (413, _TOO_LARGE))
+
+    def test_rejects_chunked_body_over_limit(self) -> None:
+        body = _multipart(_file_part(b"a" * (_MAX_UPLOAD_BYTES + 1), "audio/mpeg"))
+
+        self.assertEqual(self._post(_chunks(body, 16 * 1024)), (413, _TOO_LARGE))
+
+
+class UploadValidationStreamingTest(unittest.IsolatedAsyncioTestCase):
+    """Cuerpos por chunks entregados en varios mensajes ASGI, como los recibe el servidor."""
+
+    async def _call(self, body: bytes) -> tuple[int, bytes]:
+        app = fastapi_app.create_app(manager.ServiceManager(_FakeTranscriptionService()), max_upload_bytes=_MAX_UPLOAD_BYTES)
+        messages: list[Message] = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in _chunks(body, 16 * 1024)]
+        messages.append({"type": "http.request", "body": b"", "more_body": False})
+        sent: list[Message] = []
+
+        async def receive() -> Message:
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/transcribe",
+            "headers": [(b"content-type", _MULTIPART_CONTENT_TYPE.encode("latin-1"))],
+            "query_string": b"",
+        }
+        await app(scope, receive, send)
+        statuses = [message["status"] for message in sent if message["type"] == "http.response.start"]
+        self.assertEqual(len(statuses), 1)
+        return statuses[0], b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+    async def test_rejects_chunked_body_over_limit_while_app_reads_it(self) -> None:
+        status_code, body = await self._call(_multipart(_file_part(b"a" * (_MAX_UPLOAD_BYTES + 1), "audio/mpeg")))
+
+        self.assertEqual(status_code, 413)
+        self.assertEqual(body.decode("utf-8"), '{"success":false,"error":"El archivo supera el tamaño máximo permitido"}')
+
+    async def test_replays_chunked_body_under_limit_intact(self) -> None:
+        status_code, body = await self._call(_multipart(_field("model", b"whisper-1"), _file_part(b"a" * 100_000, "audio/mpeg")))
+
+        self.assertEqual(status_code, 200)
+        self.assertIn(b"audio.mp3:100000:whisper-1", body)
+
+
+def _field(name: str, value: bytes) -> bytes:
+    """Parte multipart de un campo de formulario."""
+    return f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode("latin-1") + value
+
+
+def _file_part(content: bytes, content_type: str | None) -> bytes:
+    """Parte multipart del campo `file`, con Content-Type opcional."""
+    headers = 'Content-Disposition: form-data; name="file"; filename="audio.mp3"\r\n'
+    if content_type is not None:
+        headers += f"Content-Type: {content_type}\r\n"
+    return f"{headers}\r\n".encode("latin-1") + content
+
+
+def _multipart(*parts: bytes) -> bytes:
+    """Cuerpo multipart con las partes dadas."""
+    delimiter = f"--{_BOUNDARY}\r\n".encode("latin-1")
+    return b"".join(delimiter + part + b"\r\n" for part in parts) + f"--{_BOUNDARY}--\r\n".encode("latin-1")
+
+
+def _chunks(body: bytes, size: int) -> Iterator[bytes]:
+    """Divide el cuerpo en bloques, como una transferencia por chunks."""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]